@@ -99,6 +99,7 @@ class AIClient:
 
     def _fallback_matching(self) -> Dict[str, Any]:
         return {
+            "fallback": True,
             "match_score": 70.0,
             "tech_match_score": 70.0,
             "experience_match_score": 70.0,
@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import asyncpg
+
+from main import DATABASE_CONFIG
+
+
+SEED_DAYS = 180
+HISTORY_QUERY = "SELECT role, content FROM chat_messages WHERE session_id = $1 ORDER BY created_at ASC"
+
+
+async def _is_partitioned(conn: asyncpg.Connection) -> bool:
+    return await conn.fetchval("SELECT relkind = 'p' FROM pg_class WHERE oid = 'chat_messages'::regclass")
+
+
+async def seed_sessions(conn: asyncpg.Connection, sessions: int, messages_per_session: int) -> None:
+    """파티션 전/후 비교용 더미 세션과 메시지를 생성합니다 (최근 6개월에 분산)."""
+    session_ids = await conn.fetch(
+        """
+        INSERT INTO chat_sessions (title, status, last_message_at)
+        SELECT '벤치마크 세션', 'active', NOW() - (g % $2) * INTERVAL '1 day'
+        FROM generate_series(1, $1) AS g
+        RETURNING id
+        """,
+        sessions,
+        SEED_DAYS,
+    )
+    if await _is_partitioned(conn):
+        # 시드 기간 전체에 월 파티션을 먼저 만들어 기본 파티션에 몰리지 않게 합니다.
+        await conn.execute(
+            "SELECT * FROM create_chat_message_partitions((CURRENT_DATE - $1::int), $2)",
+            SEED_DAYS,
+            SEED_DAYS // 30 + 2,
+        )
+    await conn.execute(
+        """
+        INSERT INTO chat_messages (session_id, role, content, created_at)
+        SELECT s.id,
+               CASE WHEN m % 2 = 0 THEN 'user' ELSE 'assistant' END,
+               repeat('벤치마크 메시지 ', 20),
+               NOW() - (s.id % $3) * INTERVAL '1 day' + m * INTERVAL '1 minute'
+        FROM unnest($1::int[]) AS s(id), generate_series(1, $2) AS m
+        """,
+        [row["id"] for row in session_ids],
+        messages_per_session,
+        SEED_DAYS,
+    )
+    await conn.execute("ANALYZE chat_messages")
+
+
+async def measure(conn: asyncpg.Connection, session_ids: List[int], rounds: int) -> List[float]:
+    timings = []
+    for _ in range(rounds):
+        for session_id in session_ids:
+            started = time.perf_counter()
+            await conn.fetch(HISTORY_QUERY, session_id)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="chat_messages 히스토리 조회 지연 측정")
+    parser.add_argument("--seed", type=int, default=0, help="생성할 더미 세션 수 (0이면 생략)")
+    parser.add_argument("--messages", type=int, default=50, help="더미 세션당 메시지 수")
+    parser.add_argument("--sample", type=int, default=200, help="측정할 세션 수")
+    parser.add_argument("--rounds", type=int, default=5, help="세션별 반복 횟수")
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(**DATABASE_CONFIG)
+    try:
+        if args.seed:
+            await seed_sessions(conn, args.seed, args.messages)
+
+        partitioned = await _is_partitioned(conn)
+        default_rows = (
+            await conn.fetchval("SELECT COUNT(*) FROM chat_messages_default") if partitioned else None
+        )
+        rows = await conn.fetch(
+            "SELECT id FROM chat_sessions WHERE status = 'active' ORDER BY random() LIMIT $1",
+            args.sample,
+        )
+        session_ids = [row["id"] for row in rows]
+        if not session_ids:
+            print("측정할 세션이 없습니다. --seed 옵션으로 데이터를 생성하세요.")
+            return
+
+        timings = await measure(conn, session_ids, args.rounds)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+
+        print(f"chat_messages 파티션 여부: {partitioned}")
+        if partitioned:
+            print(f"기본 파티션 행 수: {default_rows}")
+        print(f"조회 {len(timings)}회 (세션 {len(session_ids)}개 x {args.rounds}회)")
+        print(f"  mean {statistics.mean(timings):.2f} ms / p50 {statistics.median(timings):.2f} ms / p95 {p95:.2f} ms")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
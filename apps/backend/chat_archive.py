@@ -0,0 +1,227 @@
+import argparse
+import asyncio
+import json
+import sys
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+
+ARCHIVE_AFTER_DAYS = 30
+PARTITION_MONTHS_AHEAD = 3
+
+
+def _encode_transcript(rows: List[asyncpg.Record]) -> bytes:
+    messages = [
+        {
+            "id": row["id"],
+            "role": row["role"],
+            "content": row["content"],
+            "metadata": row["metadata"],
+            "created_at": row["created_at"].isoformat(),
+            "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
+        }
+        for row in rows
+    ]
+    return zlib.compress(json.dumps(messages, ensure_ascii=False).encode("utf-8"), 9)
+
+
+def _decode_transcript(blob: bytes) -> List[Dict[str, Any]]:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+async def archive_session(conn: asyncpg.Connection, session_id: int) -> int:
+    """세션 메시지를 압축 transcript 한 건으로 옮기고 chat_messages에서 제거합니다."""
+    async with conn.transaction():
+        session = await conn.fetchrow(
+            "SELECT id FROM chat_sessions WHERE id = $1 AND status = 'active' FOR UPDATE",
+            session_id,
+        )
+        if not session:
+            return 0
+
+        rows = await conn.fetch(
+            """
+            SELECT id, role, content, metadata, created_at, updated_at
+            FROM chat_messages
+            WHERE session_id = $1
+            ORDER BY created_at ASC, id ASC
+            """,
+            session_id,
+        )
+        if not rows:
+            return 0
+
+        await conn.execute(
+            """
+            INSERT INTO chat_session_archives
+                (session_id, message_count, first_message_at, last_message_at, transcript, archived_at)
+            VALUES ($1, $2, $3, $4, $5, NOW())
+            """,
+            session_id,
+            len(rows),
+            rows[0]["created_at"],
+            rows[-1]["created_at"],
+            _encode_transcript(rows),
+        )
+
+        await conn.execute(
+            """
+            DELETE FROM chat_messages
+            WHERE session_id = $1 AND id = ANY($2::int[])
+              AND created_at BETWEEN $3 AND $4
+            """,
+            session_id,
+            [row["id"] for row in rows],
+            rows[0]["created_at"],
+            rows[-1]["created_at"],
+        )
+
+        await conn.execute(
+            "UPDATE chat_sessions SET status = 'archived', updated_at = NOW() WHERE id = $1",
+            session_id,
+        )
+
+    return len(rows)
+
+
+async def load_archived_messages(conn: asyncpg.Connection, session_id: int) -> List[Dict[str, Any]]:
+    """보관된 transcript를 chat_messages에 복원하지 않고 메모리에서만 풀어 반환합니다 (읽기 전용)."""
+    blob = await conn.fetchval(
+        "SELECT transcript FROM chat_session_archives WHERE session_id = $1",
+        session_id,
+    )
+    if not blob:
+        return []
+    return [
+        {
+            **message,
+            "session_id": session_id,
+            "created_at": _parse_timestamp(message["created_at"]),
+            "updated_at": _parse_timestamp(message["updated_at"]),
+        }
+        for message in _decode_transcript(blob)
+    ]
+
+
+async def rehydrate_session(conn: asyncpg.Connection, session_id: int) -> int:
+    """보관된 transcript를 chat_messages로 복원하고 세션을 다시 활성화합니다 (새 메시지를 쓸 때만).
+
+    복원만으로 비활성 기간이 초기화되지 않도록 last_message_at은 유지합니다.
+    """
+    async with conn.transaction():
+        blob = await conn.fetchval(
+            "DELETE FROM chat_session_archives WHERE session_id = $1 RETURNING transcript",
+            session_id,
+        )
+
+        messages = _decode_transcript(blob) if blob else []
+        if messages:
+            await conn.execute(
+                """
+                INSERT INTO chat_messages (id, session_id, role, content, metadata, created_at, updated_at)
+                SELECT m.id, $1, m.role, m.content, m.metadata::jsonb, m.created_at, m.updated_at
+                FROM unnest($2::int[], $3::text[], $4::text[], $5::text[], $6::timestamp[], $7::timestamp[])
+                    AS m(id, role, content, metadata, created_at, updated_at)
+                """,
+                session_id,
+                [message["id"] for message in messages],
+                [message["role"] for message in messages],
+                [message["content"] for message in messages],
+                [message["metadata"] for message in messages],
+                [_parse_timestamp(message["created_at"]) for message in messages],
+                [_parse_timestamp(message["updated_at"]) for message in messages],
+            )
+
+        await conn.execute(
+            "UPDATE chat_sessions SET status = 'active', updated_at = NOW() WHERE id = $1",
+            session_id,
+        )
+
+    return len(messages)
+
+
+async def ensure_chat_partitions(
+    conn: asyncpg.Connection, months_ahead: int = PARTITION_MONTHS_AHEAD
+) -> Dict[str, List[str]]:
+    """이번 달부터 months_ahead개월치 파티션을 준비합니다. 보관 작업과 별도 주기로 실행합니다.
+
+    새로 만든 파티션은 created, 실패한 파티션은 "이름: 오류" 형태로 failed에 담아 반환합니다.
+    """
+    rows = await conn.fetch(
+        "SELECT month_partition, error_message FROM create_chat_message_partitions(CURRENT_DATE, $1)",
+        months_ahead + 1,
+    )
+    return {
+        "created": [row["month_partition"] for row in rows if row["error_message"] is None],
+        "failed": [f"{row['month_partition']}: {row['error_message']}" for row in rows if row["error_message"]],
+    }
+
+
+async def archive_inactive_sessions(
+    conn: asyncpg.Connection,
+    inactive_days: int = ARCHIVE_AFTER_DAYS,
+    limit: int = 500,
+) -> Dict[str, int]:
+    session_ids = await conn.fetch(
+        """
+        SELECT id FROM chat_sessions
+        WHERE status = 'active' AND last_message_at < NOW() - make_interval(days => $1)
+        ORDER BY last_message_at ASC
+        LIMIT $2
+        """,
+        inactive_days,
+        limit,
+    )
+
+    archived_sessions = 0
+    archived_messages = 0
+    for row in session_ids:
+        count = await archive_session(conn, row["id"])
+        if count:
+            archived_sessions += 1
+            archived_messages += count
+
+    return {"sessions": archived_sessions, "messages": archived_messages}
+
+
+async def main() -> None:
+    from main import DATABASE_CONFIG
+
+    parser = argparse.ArgumentParser(description="채팅 메시지 파티션 관리 및 비활성 세션 보관 작업")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    archive_parser = subparsers.add_parser("archive", help="비활성 세션을 압축 보관")
+    archive_parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="마지막 메시지 이후 경과 일수")
+    archive_parser.add_argument("--limit", type=int, default=500, help="한 번에 처리할 최대 세션 수")
+
+    partitions_parser = subparsers.add_parser("partitions", help="앞으로 사용할 월 파티션 생성")
+    partitions_parser.add_argument(
+        "--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD, help="미리 만들 개월 수"
+    )
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(**DATABASE_CONFIG)
+    try:
+        if args.command == "partitions":
+            result = await ensure_chat_partitions(conn, args.months_ahead)
+            print(f"파티션 생성 완료: {len(result['created'])}개")
+            if result["failed"]:
+                for failure in result["failed"]:
+                    print(f"파티션 생성 실패: {failure}", file=sys.stderr)
+                sys.exit(1)
+        else:
+            result = await archive_inactive_sessions(conn, args.days, args.limit)
+            print(f"보관 완료: 세션 {result['sessions']}개, 메시지 {result['messages']}개")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
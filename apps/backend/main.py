@@ -1,14 +1,16 @@
 import json
 import os
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Dict, List, Optional
 
 import asyncpg
 from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 
 from ai_client import AIClient
+from chat_archive import load_archived_messages, rehydrate_session
+from resume_features import load_resume_features, refresh_resume_features, score_jobs
 
 
 AI_SERVER_URL = os.getenv("AI_SERVER_URL", "http://localhost:5000")
@@ -19,6 +21,8 @@ DATABASE_CONFIG = {
     "host": os.getenv("DB_HOST", "localhost"),
     "port": int(os.getenv("DB_PORT", "5432")),
 }
+RESUME_MATCH_LIMIT = 50
+MATCH_BATCH_LIMIT = 200
 
 
 app = FastAPI(title="AI Job Matching API")
@@ -51,6 +55,73 @@ class ChatMessageResponse(BaseModel):
     created_at: datetime
 
 
+def _blank_to_none(value: Any) -> Any:
+    # ResumeForm은 비어 있는 날짜 입력을 ''로 보냅니다.
+    if isinstance(value, str) and not value.strip():
+        return None
+    return value
+
+
+def _strip_text(value: Any) -> Any:
+    # 공백만 입력한 값이 min_length 검사를 통과하지 않도록 먼저 다듬습니다.
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def _drop_blank_items(value: Any) -> Any:
+    # ResumeForm은 입력 줄을 ['']로 시작하므로 빈 항목을 제거합니다.
+    if isinstance(value, list):
+        return [item.strip() for item in value if isinstance(item, str) and item.strip()]
+    return value
+
+
+class ResumeExperiencePayload(BaseModel):
+    company_name: str = Field(..., min_length=1)
+    position: str = Field(..., min_length=1)
+    start_date: date
+    end_date: Optional[date] = None
+    is_current: bool = False
+    responsibilities: List[str] = []
+
+    _normalize_text = validator("company_name", "position", pre=True, allow_reuse=True)(_strip_text)
+    _normalize_dates = validator("start_date", "end_date", pre=True, allow_reuse=True)(_blank_to_none)
+    _normalize_lists = validator("responsibilities", pre=True, allow_reuse=True)(_drop_blank_items)
+
+
+class ResumeProjectPayload(BaseModel):
+    project_name: str = Field(..., min_length=1)
+    role: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    tech_stacks: List[str] = []
+    key_features: List[str] = []
+    outcomes: List[str] = []
+    description: Optional[str] = None
+
+    _normalize_dates = validator("start_date", "end_date", pre=True, allow_reuse=True)(_blank_to_none)
+    _normalize_lists = validator(
+        "tech_stacks", "key_features", "outcomes", pre=True, allow_reuse=True
+    )(_drop_blank_items)
+
+
+class ResumeSkillCategory(BaseModel):
+    category: str = Field(..., min_length=1)
+    skills: List[str] = []
+
+
+class ResumeSkillsPayload(BaseModel):
+    categories: List[ResumeSkillCategory]
+
+
+class MatchIdsPayload(BaseModel):
+    match_ids: List[int] = Field(..., min_items=1, max_items=MATCH_BATCH_LIMIT)
+
+
+class MatchBookmarkBatchPayload(MatchIdsPayload):
+    is_bookmarked: Optional[bool] = None
+
+
 class ChatSessionResponse(BaseModel):
     session_id: int
     title: str
@@ -66,7 +137,7 @@ SYSTEM_PROMPT = (
 )
 
 
-def _row_to_message(row: asyncpg.Record) -> ChatMessageResponse:
+def _row_to_message(row: Any) -> ChatMessageResponse:
     return ChatMessageResponse(
         id=row["id"],
         session_id=row["session_id"],
@@ -83,6 +154,27 @@ async def _ensure_session(conn: asyncpg.Connection, session_id: int) -> asyncpg.
     return session
 
 
+async def _ensure_history(conn: asyncpg.Connection, session: asyncpg.Record) -> None:
+    """보관된 세션에 새 메시지를 쓰기 전에 chat_messages로 복원합니다."""
+    if session["status"] == "archived":
+        await rehydrate_session(conn, session["id"])
+
+
+async def _load_history(conn: asyncpg.Connection, session: asyncpg.Record) -> List[Dict[str, str]]:
+    # 읽기 경로에서는 보관된 세션을 복원하지 않고 transcript를 메모리에서만 풉니다.
+    if session["status"] == "archived":
+        messages = await load_archived_messages(conn, session["id"])
+        return [{"role": message["role"], "content": message["content"]} for message in messages]
+    return await _fetch_history(conn, session["id"])
+
+
+async def _ensure_resume(conn: asyncpg.Connection, resume_id: int) -> asyncpg.Record:
+    resume = await conn.fetchrow("SELECT * FROM resumes WHERE id = $1", resume_id)
+    if not resume:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "지원서를 찾을 수 없습니다.")
+    return resume
+
+
 async def _fetch_history(conn: asyncpg.Connection, session_id: int) -> List[Dict[str, str]]:
     rows = await conn.fetch(
         "SELECT role, content FROM chat_messages WHERE session_id = $1 ORDER BY created_at ASC",
@@ -91,6 +183,25 @@ async def _fetch_history(conn: asyncpg.Connection, session_id: int) -> List[Dict
     return [{"role": row["role"], "content": row["content"]} for row in rows]
 
 
+def _keyword_list(value: Any) -> List[str]:
+    """프로필 JSON(dict/list/str)에서 소문자 키워드 목록을 뽑습니다 (GIN 인덱스 검색용)."""
+    if isinstance(value, dict):
+        items = [item for nested in value.values() if isinstance(nested, list) for item in nested]
+    elif isinstance(value, list):
+        items = value
+    elif isinstance(value, str):
+        items = [value]
+    else:
+        items = []
+
+    keywords: List[str] = []
+    for item in items:
+        keyword = str(item).strip().lower()
+        if keyword and keyword not in keywords:
+            keywords.append(keyword)
+    return keywords
+
+
 async def _store_profile(conn: asyncpg.Connection, session_id: int, profile: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if not profile:
         return None
@@ -103,16 +214,20 @@ async def _store_profile(conn: asyncpg.Connection, session_id: int, profile: Dic
     if isinstance(improvements, str):
         improvements = [improvements]
 
+    preferences = profile.get("preferences") or {}
+    if not isinstance(preferences, dict):
+        preferences = {}
+
     skills_json = json.dumps(profile.get("skills") or {})
     experiences_json = json.dumps(profile.get("experiences") or {})
-    preferences_json = json.dumps(profile.get("preferences") or {})
+    preferences_json = json.dumps(preferences)
 
     await conn.execute(
         """
         INSERT INTO candidate_profiles
             (session_id, headline, summary, strengths, improvements, skills, experiences, preferences,
-             last_generated_at, updated_at)
-        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, NOW(), NOW())
+             skill_keywords, preferred_roles, last_generated_at, updated_at)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, NOW(), NOW())
         ON CONFLICT (session_id) DO UPDATE
         SET headline = EXCLUDED.headline,
             summary = EXCLUDED.summary,
@@ -121,6 +236,8 @@ async def _store_profile(conn: asyncpg.Connection, session_id: int, profile: Dic
             skills = EXCLUDED.skills,
             experiences = EXCLUDED.experiences,
             preferences = EXCLUDED.preferences,
+            skill_keywords = EXCLUDED.skill_keywords,
+            preferred_roles = EXCLUDED.preferred_roles,
             last_generated_at = NOW(),
             updated_at = NOW()
         """,
@@ -132,6 +249,8 @@ async def _store_profile(conn: asyncpg.Connection, session_id: int, profile: Dic
         skills_json,
         experiences_json,
         preferences_json,
+        _keyword_list(profile.get("skills")),
+        _keyword_list(preferences.get("roles")),
     )
 
     await conn.execute(
@@ -250,7 +369,10 @@ async def get_chat_messages(
     session_id: int,
     conn: asyncpg.Connection = Depends(get_db),
 ):
-    await _ensure_session(conn, session_id)
+    session = await _ensure_session(conn, session_id)
+    if session["status"] == "archived":
+        return [_row_to_message(message) for message in await load_archived_messages(conn, session_id)]
+
     rows = await conn.fetch(
         "SELECT id, session_id, role, content, created_at FROM chat_messages WHERE session_id = $1 ORDER BY created_at ASC",
         session_id,
@@ -264,7 +386,8 @@ async def send_chat_message(
     payload: ChatMessagePayload,
     conn: asyncpg.Connection = Depends(get_db),
 ):
-    await _ensure_session(conn, session_id)
+    session = await _ensure_session(conn, session_id)
+    await _ensure_history(conn, session)
 
     user_row = await conn.fetchrow(
         """
@@ -342,7 +465,8 @@ async def list_job_postings(
     return {"total": len(rows), "jobs": [dict(row) for row in rows]}
 
 
-async def _ensure_profile(conn: asyncpg.Connection, session_id: int) -> Dict[str, Any]:
+async def _ensure_profile(conn: asyncpg.Connection, session: asyncpg.Record) -> Dict[str, Any]:
+    session_id = session["id"]
     profile_row = await conn.fetchrow(
         "SELECT * FROM candidate_profiles WHERE session_id = $1",
         session_id,
@@ -350,7 +474,7 @@ async def _ensure_profile(conn: asyncpg.Connection, session_id: int) -> Dict[str
     if profile_row:
         return _profile_row_to_dict(profile_row) or {}
 
-    history = await _fetch_history(conn, session_id)
+    history = await _load_history(conn, session)
     profile_data = await ai_client.extract_profile(history)
     await _store_profile(conn, session_id, profile_data)
     refreshed = await conn.fetchrow(
@@ -360,6 +484,38 @@ async def _ensure_profile(conn: asyncpg.Connection, session_id: int) -> Dict[str
     return _profile_row_to_dict(refreshed) or {}
 
 
+def _match_row_to_dict(row: asyncpg.Record) -> Dict[str, Any]:
+    analysis = row["analysis"] or {}
+    if isinstance(analysis, str):
+        analysis = json.loads(analysis)
+    return {
+        "match_id": row["id"],
+        "job_id": row["job_posting_id"],
+        "company": row["company_name"],
+        "title": row["title"],
+        "position": row["position"],
+        "location": row["location"],
+        "experience": row["experience_text"],
+        "tech_stacks": row["tech_stacks"] or [],
+        "salary": row["salary_text"],
+        "deadline": row["deadline"].isoformat() if row["deadline"] else None,
+        "match_score": float(row["match_score"]),
+        "score_breakdown": {
+            "tech": float(row["tech_match_score"]) if row["tech_match_score"] else 0.0,
+            "experience": float(row["experience_match_score"]) if row["experience_match_score"] else 0.0,
+            "personality": float(row["personality_match_score"]) if row["personality_match_score"] else 0.0,
+        },
+        "analysis": {
+            "summary": analysis.get("overall_summary"),
+            "strengths": analysis.get("strengths", []),
+            "improvements": analysis.get("improvements", []),
+            "scorer": analysis.get("scorer", "ai"),
+        },
+        "is_bookmarked": row["is_bookmarked"],
+        "is_applied": row["is_applied"],
+    }
+
+
 @app.get("/api/chat/sessions/{session_id}/matches")
 async def get_session_matches(
     session_id: int,
@@ -367,8 +523,8 @@ async def get_session_matches(
     limit: int = 20,
     conn: asyncpg.Connection = Depends(get_db),
 ):
-    await _ensure_session(conn, session_id)
-    profile = await _ensure_profile(conn, session_id)
+    session = await _ensure_session(conn, session_id)
+    profile = await _ensure_profile(conn, session)
 
     if refresh or not await conn.fetchval(
         "SELECT 1 FROM job_matches WHERE session_id = $1",
@@ -423,38 +579,325 @@ async def get_session_matches(
         limit,
     )
 
-    response = []
-    for row in matches:
-        analysis = row["analysis"] or {}
-        response.append(
-            {
-                "match_id": row["id"],
-                "job_id": row["job_posting_id"],
-                "company": row["company_name"],
-                "title": row["title"],
-                "position": row["position"],
-                "location": row["location"],
-                "experience": row["experience_text"],
-                "tech_stacks": row["tech_stacks"] or [],
-                "salary": row["salary_text"],
-                "deadline": row["deadline"].isoformat() if row["deadline"] else None,
-                "match_score": float(row["match_score"]),
-                "score_breakdown": {
-                    "tech": float(row["tech_match_score"]) if row["tech_match_score"] else 0.0,
-                    "experience": float(row["experience_match_score"]) if row["experience_match_score"] else 0.0,
-                    "personality": float(row["personality_match_score"]) if row["personality_match_score"] else 0.0,
-                },
-                "analysis": {
-                    "summary": analysis.get("overall_summary"),
-                    "strengths": analysis.get("strengths", []),
-                    "improvements": analysis.get("improvements", []),
+    response = [_match_row_to_dict(row) for row in matches]
+
+    return {"profile": profile, "total": len(response), "matches": response}
+
+
+@app.post("/api/resumes/{resume_id}/experiences")
+async def add_resume_experience(
+    resume_id: int,
+    payload: ResumeExperiencePayload,
+    conn: asyncpg.Connection = Depends(get_db),
+):
+    await _ensure_resume(conn, resume_id)
+    async with conn.transaction():
+        experience_id = await conn.fetchval(
+            """
+            INSERT INTO resume_experiences
+                (resume_id, company_name, position, start_date, end_date, is_current, responsibilities, display_order)
+            VALUES ($1, $2, $3, $4, $5, $6, $7,
+                    (SELECT COUNT(*) FROM resume_experiences WHERE resume_id = $1))
+            RETURNING id
+            """,
+            resume_id,
+            payload.company_name,
+            payload.position,
+            payload.start_date,
+            payload.end_date,
+            payload.is_current,
+            payload.responsibilities,
+        )
+        await refresh_resume_features(conn, resume_id, ["experiences"])
+    return {"id": experience_id}
+
+
+@app.post("/api/resumes/{resume_id}/projects")
+async def add_resume_project(
+    resume_id: int,
+    payload: ResumeProjectPayload,
+    conn: asyncpg.Connection = Depends(get_db),
+):
+    await _ensure_resume(conn, resume_id)
+    async with conn.transaction():
+        project_id = await conn.fetchval(
+            """
+            INSERT INTO resume_projects
+                (resume_id, project_name, start_date, end_date, role, tech_stacks, key_features, outcomes,
+                 description, display_order)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9,
+                    (SELECT COUNT(*) FROM resume_projects WHERE resume_id = $1))
+            RETURNING id
+            """,
+            resume_id,
+            payload.project_name,
+            payload.start_date,
+            payload.end_date,
+            payload.role,
+            json.dumps(payload.tech_stacks),
+            payload.key_features,
+            payload.outcomes,
+            payload.description,
+        )
+        await refresh_resume_features(conn, resume_id, ["projects"])
+    return {"id": project_id}
+
+
+@app.put("/api/resumes/{resume_id}/skills")
+async def replace_resume_skills(
+    resume_id: int,
+    payload: ResumeSkillsPayload,
+    conn: asyncpg.Connection = Depends(get_db),
+):
+    await _ensure_resume(conn, resume_id)
+    async with conn.transaction():
+        await conn.execute("DELETE FROM resume_skills WHERE resume_id = $1", resume_id)
+        await conn.executemany(
+            """
+            INSERT INTO resume_skills (resume_id, category, skills, display_order)
+            VALUES ($1, $2, $3, $4)
+            """,
+            [
+                (resume_id, item.category, item.skills, order)
+                for order, item in enumerate(payload.categories)
+            ],
+        )
+        await refresh_resume_features(conn, resume_id, ["skills"])
+    return {"categories": len(payload.categories)}
+
+
+@app.get("/api/resumes/{resume_id}/matches")
+async def get_resume_matches(
+    resume_id: int,
+    refresh: bool = False,
+    refine: bool = False,
+    limit: int = 20,
+    conn: asyncpg.Connection = Depends(get_db),
+):
+    await _ensure_resume(conn, resume_id)
+
+    if refresh or not await conn.fetchval(
+        "SELECT 1 FROM job_matches WHERE resume_id = $1",
+        resume_id,
+    ):
+        features = await load_resume_features(conn, resume_id)
+        jobs = await conn.fetch(
+            """
+            SELECT id, position, experience_min, experience_max, tech_stacks
+            FROM job_postings
+            WHERE is_active = TRUE
+            """
+        )
+        scored = score_jobs(features, jobs)[:RESUME_MATCH_LIMIT]
+
+        if refine and scored:
+            # AI 점수와 키워드 점수가 한 목록에서 섞여 정렬되지 않도록 보정한 행만 저장합니다.
+            scored = scored[:limit]
+            profile = {
+                "skills": {"keywords": features["skills"] + features["project_tech"]},
+                "experiences": {
+                    "positions": features["positions"],
+                    "months": features["experience_months"],
                 },
-                "is_bookmarked": row["is_bookmarked"],
-                "is_applied": row["is_applied"],
             }
+            refine_ids = [item["job_id"] for item in scored]
+            job_rows = await conn.fetch("SELECT * FROM job_postings WHERE id = ANY($1::int[])", refine_ids)
+            jobs_by_id = {row["id"]: row for row in job_rows}
+            for item in scored:
+                job = jobs_by_id.get(item["job_id"])
+                if not job:
+                    continue
+                ai_result = await ai_client.analyze_match(profile, dict(job))
+                if ai_result.get("fallback"):
+                    # AI 서버 응답이 없으면 고정 점수 대신 키워드 점수를 유지합니다.
+                    continue
+                item.update(
+                    {
+                        "match_score": float(ai_result.get("match_score", item["match_score"])),
+                        "tech_match_score": ai_result.get("tech_match_score", item["tech_match_score"]),
+                        "experience_match_score": ai_result.get(
+                            "experience_match_score", item["experience_match_score"]
+                        ),
+                        "personality_match_score": ai_result.get("personality_match_score"),
+                        "location_match_score": ai_result.get("location_match_score"),
+                        "analysis": ai_result.get("analysis") or item["analysis"],
+                    }
+                )
+
+        async with conn.transaction():
+            await conn.execute(
+                """
+                INSERT INTO job_matches (
+                    session_id, resume_id, job_posting_id, match_score, analysis,
+                    tech_match_score, experience_match_score, personality_match_score, location_match_score,
+                    created_at, updated_at
+                )
+                SELECT NULL, $1, m.job_id, m.match_score, m.analysis::jsonb,
+                       m.tech_score, m.experience_score, m.personality_score, m.location_score, NOW(), NOW()
+                FROM unnest($2::int[], $3::float8[], $4::text[], $5::float8[], $6::float8[], $7::float8[], $8::float8[])
+                    AS m(job_id, match_score, analysis, tech_score, experience_score, personality_score, location_score)
+                ON CONFLICT (resume_id, job_posting_id) DO UPDATE
+                SET match_score = EXCLUDED.match_score,
+                    analysis = EXCLUDED.analysis,
+                    tech_match_score = EXCLUDED.tech_match_score,
+                    experience_match_score = EXCLUDED.experience_match_score,
+                    personality_match_score = EXCLUDED.personality_match_score,
+                    location_match_score = EXCLUDED.location_match_score,
+                    updated_at = NOW()
+                """,
+                resume_id,
+                [item["job_id"] for item in scored],
+                [item["match_score"] for item in scored],
+                [json.dumps(item["analysis"]) for item in scored],
+                [item["tech_match_score"] for item in scored],
+                [item["experience_match_score"] for item in scored],
+                [item.get("personality_match_score") for item in scored],
+                [item.get("location_match_score") for item in scored],
+            )
+
+            # 카탈로그 전체를 다시 점수화했으므로 새 상위 목록에서 빠진 이전 결과는 지웁니다.
+            await conn.execute(
+                """
+                DELETE FROM job_matches jm
+                WHERE jm.resume_id = $1
+                  AND NOT (jm.job_posting_id = ANY($2::int[]))
+                  AND NOT COALESCE(jm.is_bookmarked, FALSE)
+                  AND NOT COALESCE(jm.is_applied, FALSE)
+                  AND NOT EXISTS (SELECT 1 FROM applications a WHERE a.match_id = jm.id)
+                """,
+                resume_id,
+                [item["job_id"] for item in scored],
+            )
+
+    matches = await conn.fetch(
+        """
+        SELECT jm.*, jp.company_name, jp.title, jp.position, jp.location, jp.experience_text,
+               jp.tech_stacks, jp.salary_text, jp.deadline
+        FROM job_matches jm
+        JOIN job_postings jp ON jm.job_posting_id = jp.id
+        WHERE jm.resume_id = $1 AND jp.is_active = TRUE
+        ORDER BY jm.match_score DESC
+        LIMIT $2
+        """,
+        resume_id,
+        limit,
+    )
+
+    response = [_match_row_to_dict(row) for row in matches]
+    return {"total": len(response), "matches": response}
+
+
+async def _set_match_bookmarks(
+    conn: asyncpg.Connection,
+    match_ids: List[int],
+    is_bookmarked: Optional[bool],
+) -> Dict[int, bool]:
+    """is_bookmarked가 None이면 각 매칭의 현재 값을 뒤집습니다."""
+    rows = await conn.fetch(
+        """
+        UPDATE job_matches jm
+        SET is_bookmarked = COALESCE($2::boolean, NOT COALESCE(jm.is_bookmarked, FALSE)),
+            updated_at = NOW()
+        FROM unnest($1::int[]) AS ids(id)
+        WHERE jm.id = ids.id
+        RETURNING jm.id, jm.is_bookmarked
+        """,
+        match_ids,
+        is_bookmarked,
+    )
+    return {row["id"]: row["is_bookmarked"] for row in rows}
+
+
+async def _apply_matches(conn: asyncpg.Connection, match_ids: List[int]) -> List[int]:
+    rows = await conn.fetch(
+        """
+        WITH applied AS (
+            UPDATE job_matches jm
+            SET is_applied = TRUE,
+                applied_at = COALESCE(jm.applied_at, NOW()),
+                updated_at = NOW()
+            FROM unnest($1::int[]) AS ids(id)
+            WHERE jm.id = ids.id
+            RETURNING jm.id, jm.resume_id, jm.session_id, jm.job_posting_id
+        ), submitted AS (
+            INSERT INTO applications (resume_id, session_id, job_posting_id, match_id, status)
+            SELECT resume_id, session_id, job_posting_id, id, 'submitted'
+            FROM applied
+            ON CONFLICT DO NOTHING
         )
+        SELECT id FROM applied
+        """,
+        match_ids,
+    )
+    return [row["id"] for row in rows]
 
-    return {"profile": profile, "total": len(response), "matches": response}
+
+@app.post("/api/matches/bookmarks")
+async def bulk_update_match_bookmarks(
+    payload: MatchBookmarkBatchPayload,
+    conn: asyncpg.Connection = Depends(get_db),
+):
+    match_ids = list(dict.fromkeys(payload.match_ids))
+    async with conn.transaction():
+        updated = await _set_match_bookmarks(conn, match_ids, payload.is_bookmarked)
+
+    return {
+        "matches": [
+            {"match_id": match_id, "is_bookmarked": is_bookmarked}
+            for match_id, is_bookmarked in updated.items()
+        ],
+        "not_found": [match_id for match_id in match_ids if match_id not in updated],
+    }
+
+
+@app.post("/api/matches/applications")
+async def bulk_apply_to_matches(
+    payload: MatchIdsPayload,
+    conn: asyncpg.Connection = Depends(get_db),
+):
+    match_ids = list(dict.fromkeys(payload.match_ids))
+    async with conn.transaction():
+        applied = await _apply_matches(conn, match_ids)
+
+    applied_set = set(applied)
+    return {
+        "message": "지원 완료",
+        "match_ids": applied,
+        "not_found": [match_id for match_id in match_ids if match_id not in applied_set],
+    }
+
+
+@app.get("/api/chat/sessions/{session_id}/match-states")
+async def get_session_match_states(
+    session_id: int,
+    conn: asyncpg.Connection = Depends(get_db),
+):
+    # 세션 존재 확인을 같은 쿼리로 처리합니다 (보관된 세션도 복원하지 않음).
+    rows = await conn.fetch(
+        """
+        SELECT jm.id, jm.job_posting_id, jm.is_bookmarked, jm.is_applied, jm.applied_at
+        FROM chat_sessions cs
+        LEFT JOIN job_matches jm ON jm.session_id = cs.id
+        WHERE cs.id = $1
+        """,
+        session_id,
+    )
+    if not rows:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "채팅 세션을 찾을 수 없습니다.")
+
+    return {
+        "states": [
+            {
+                "match_id": row["id"],
+                "job_id": row["job_posting_id"],
+                "is_bookmarked": bool(row["is_bookmarked"]),
+                "is_applied": bool(row["is_applied"]),
+                "applied_at": row["applied_at"].isoformat() if row["applied_at"] else None,
+            }
+            for row in rows
+            if row["id"] is not None
+        ]
+    }
 
 
 @app.post("/api/matches/{match_id}/bookmark")
@@ -462,19 +905,10 @@ async def toggle_match_bookmark(
     match_id: int,
     conn: asyncpg.Connection = Depends(get_db),
 ):
-    current = await conn.fetchval(
-        "SELECT is_bookmarked FROM job_matches WHERE id = $1",
-        match_id,
-    )
-    if current is None:
+    updated = await _set_match_bookmarks(conn, [match_id], None)
+    if match_id not in updated:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "매칭 결과를 찾을 수 없습니다.")
-
-    await conn.execute(
-        "UPDATE job_matches SET is_bookmarked = $2, updated_at = NOW() WHERE id = $1",
-        match_id,
-        not current,
-    )
-    return {"is_bookmarked": not current}
+    return {"is_bookmarked": updated[match_id]}
 
 
 @app.post("/api/matches/{match_id}/apply")
@@ -482,30 +916,9 @@ async def apply_to_match(
     match_id: int,
     conn: asyncpg.Connection = Depends(get_db),
 ):
-    match = await conn.fetchrow(
-        "SELECT session_id, resume_id, job_posting_id FROM job_matches WHERE id = $1",
-        match_id,
-    )
-    if not match:
+    if not await _apply_matches(conn, [match_id]):
         raise HTTPException(status.HTTP_404_NOT_FOUND, "매칭 결과를 찾을 수 없습니다.")
 
-    await conn.execute(
-        """
-        INSERT INTO applications (resume_id, session_id, job_posting_id, match_id, status)
-        VALUES ($1, $2, $3, $4, 'submitted')
-        ON CONFLICT (session_id, job_posting_id) DO NOTHING
-        """,
-        match["resume_id"],
-        match["session_id"],
-        match["job_posting_id"],
-        match_id,
-    )
-
-    await conn.execute(
-        "UPDATE job_matches SET is_applied = TRUE, applied_at = NOW(), updated_at = NOW() WHERE id = $1",
-        match_id,
-    )
-
     return {"message": "지원 완료", "match_id": match_id}
 
 
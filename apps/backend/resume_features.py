@@ -0,0 +1,151 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+import asyncpg
+
+
+TECH_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.3
+POSITION_WEIGHT = 0.1
+
+# 섹션별로 resume_features의 해당 컬럼만 다시 계산하는 upsert 쿼리
+SECTION_QUERIES: Dict[str, str] = {
+    "skills": """
+        INSERT INTO resume_features (resume_id, skills, updated_at)
+        SELECT $1, COALESCE(array_agg(DISTINCT lower(btrim(skill))), '{}'), NOW()
+        FROM resume_skills rs
+        CROSS JOIN LATERAL unnest(rs.skills) AS skill
+        WHERE rs.resume_id = $1 AND btrim(skill) <> ''
+        ON CONFLICT (resume_id) DO UPDATE
+        SET skills = EXCLUDED.skills, updated_at = NOW()
+    """,
+    "projects": """
+        INSERT INTO resume_features (resume_id, project_tech, updated_at)
+        SELECT $1, COALESCE(array_agg(DISTINCT lower(btrim(tech))), '{}'), NOW()
+        FROM resume_projects rp
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(rp.tech_stacks) = 'array' THEN rp.tech_stacks ELSE '[]'::jsonb END
+        ) AS tech
+        WHERE rp.resume_id = $1 AND btrim(tech) <> ''
+        ON CONFLICT (resume_id) DO UPDATE
+        SET project_tech = EXCLUDED.project_tech, updated_at = NOW()
+    """,
+    "experiences": """
+        INSERT INTO resume_features (resume_id, positions, experience_periods, updated_at)
+        SELECT $1,
+               COALESCE(array_agg(DISTINCT lower(btrim(position))) FILTER (WHERE btrim(position) <> ''), '{}'),
+               COALESCE(range_agg(daterange(
+                   start_date,
+                   CASE WHEN is_current OR end_date IS NULL THEN 'infinity'::DATE ELSE end_date END
+               )) FILTER (WHERE end_date IS NULL OR end_date >= start_date), '{}'),
+               NOW()
+        FROM resume_experiences
+        WHERE resume_id = $1
+        ON CONFLICT (resume_id) DO UPDATE
+        SET positions = EXCLUDED.positions,
+            experience_periods = EXCLUDED.experience_periods,
+            updated_at = NOW()
+    """,
+}
+
+
+async def refresh_resume_features(
+    conn: asyncpg.Connection,
+    resume_id: int,
+    sections: Optional[Iterable[str]] = None,
+) -> None:
+    """변경된 섹션만 다시 계산합니다. sections가 없으면 전체를 재계산합니다."""
+    for section in sections or SECTION_QUERIES.keys():
+        await conn.execute(SECTION_QUERIES[section], resume_id)
+
+
+# 겹치는 재직 기간은 이미 병합되어 있으므로, 오늘까지로 자른 뒤 일수만 더합니다.
+FEATURES_QUERY = """
+    SELECT rf.skills, rf.project_tech, rf.positions,
+           COALESCE((
+               SELECT SUM(upper(period) - lower(period))
+               FROM unnest(rf.experience_periods * datemultirange(daterange(NULL, CURRENT_DATE))) AS period
+           ), 0) / 30 AS experience_months
+    FROM resume_features rf
+    WHERE rf.resume_id = $1
+"""
+
+
+async def load_resume_features(conn: asyncpg.Connection, resume_id: int) -> Dict[str, Any]:
+    row = await conn.fetchrow(FEATURES_QUERY, resume_id)
+    if not row:
+        async with conn.transaction():
+            await refresh_resume_features(conn, resume_id)
+        row = await conn.fetchrow(FEATURES_QUERY, resume_id)
+
+    return {
+        "skills": list(row["skills"] or []),
+        "project_tech": list(row["project_tech"] or []),
+        "positions": list(row["positions"] or []),
+        "experience_months": row["experience_months"] or 0,
+    }
+
+
+def job_tech_keywords(job: asyncpg.Record) -> List[str]:
+    value = job["tech_stacks"]
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return []
+    if not isinstance(value, list):
+        return []
+    return [str(item).strip().lower() for item in value if str(item).strip()]
+
+
+def _experience_fit(months: Optional[int], job: asyncpg.Record) -> float:
+    if months is None:
+        return 0.5
+    years = months / 12
+    minimum = job["experience_min"] or 0
+    maximum = job["experience_max"]
+    if years < minimum:
+        return max(0.0, 1.0 - (minimum - years) / max(minimum, 1))
+    if maximum is not None and years > maximum + 2:
+        return 0.7
+    return 1.0
+
+
+def score_jobs(features: Dict[str, Any], jobs: List[asyncpg.Record]) -> List[Dict[str, Any]]:
+    """활성 공고 전체를 한 번에 점수화해 점수 내림차순으로 반환합니다 (analysis.scorer = 'keyword')."""
+    tech = set(features["skills"]) | set(features["project_tech"])
+    positions = [position for position in features["positions"] if position]
+
+    scored = []
+    for job in jobs:
+        job_tech = job_tech_keywords(job)
+        matched = [item for item in job_tech if item in tech]
+        tech_score = len(matched) / len(job_tech) if job_tech else 0.5
+        experience_score = _experience_fit(features["experience_months"], job)
+        job_position = (job["position"] or "").lower()
+        position_score = 1.0 if job_position and any(
+            job_position in position or position in job_position for position in positions
+        ) else 0.0
+
+        match_score = 100 * (
+            TECH_WEIGHT * tech_score
+            + EXPERIENCE_WEIGHT * experience_score
+            + POSITION_WEIGHT * position_score
+        )
+        scored.append(
+            {
+                "job_id": job["id"],
+                "match_score": round(match_score, 2),
+                "tech_match_score": round(100 * tech_score, 2),
+                "experience_match_score": round(100 * experience_score, 2),
+                "analysis": {
+                    "overall_summary": f"기술 스택 {len(matched)}/{len(job_tech)}개 일치",
+                    "strengths": matched,
+                    "improvements": [item for item in job_tech if item not in tech],
+                    "scorer": "keyword",
+                },
+            }
+        )
+
+    scored.sort(key=lambda item: item["match_score"], reverse=True)
+    return scored
@@ -0,0 +1,174 @@
+import argparse
+import asyncio
+import json
+import sys
+from typing import Dict, List
+
+import asyncpg
+
+from resume_features import job_tech_keywords, score_jobs
+
+
+CANDIDATES_PER_POSTING = 100
+MIN_MATCH_SCORE = 50.0
+QUEUE_BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+
+
+async def reverse_match_posting(conn: asyncpg.Connection, job_posting_id: int) -> int:
+    """공고 하나에 대해 GIN 인덱스로 상위 후보 세션을 찾아 새 job_matches 행만 추가합니다.
+
+    매칭 목록이 아직 없는 세션은 첫 조회 시 전체 매칭을 수행하므로 대상에서 제외합니다.
+    이미 있는 (AI가 점수화한) 매칭은 덮어쓰지 않습니다. 추가한 행은 score_jobs가 남기는
+    analysis.scorer = 'keyword'로 구분되며, 세션 refresh 대상에 포함되면 AI 점수로 다시 계산됩니다.
+    """
+    job = await conn.fetchrow(
+        """
+        SELECT id, position, experience_min, experience_max, tech_stacks
+        FROM job_postings
+        WHERE id = $1 AND is_active = TRUE
+        """,
+        job_posting_id,
+    )
+    if not job:
+        return 0
+
+    tech = job_tech_keywords(job)
+    roles = [job["position"].strip().lower()] if job["position"] else []
+    if not tech and not roles:
+        return 0
+
+    candidates = await conn.fetch(
+        """
+        SELECT cp.session_id, cp.skill_keywords, cp.preferred_roles
+        FROM candidate_profiles cp
+        JOIN chat_sessions cs ON cs.id = cp.session_id
+        WHERE cs.status = 'active'
+          AND EXISTS (SELECT 1 FROM job_matches jm WHERE jm.session_id = cp.session_id)
+          AND (cp.skill_keywords && $1::text[] OR cp.preferred_roles && $2::text[])
+        ORDER BY cardinality(ARRAY(
+            SELECT unnest(cp.skill_keywords) INTERSECT SELECT unnest($1::text[])
+        )) DESC, cs.last_message_at DESC
+        LIMIT $3
+        """,
+        tech,
+        roles,
+        CANDIDATES_PER_POSTING,
+    )
+
+    rows = []
+    for candidate in candidates:
+        features = {
+            "skills": list(candidate["skill_keywords"] or []),
+            "project_tech": [],
+            "positions": list(candidate["preferred_roles"] or []),
+            "experience_months": None,
+        }
+        scored = score_jobs(features, [job])[0]
+        if scored["match_score"] >= MIN_MATCH_SCORE:
+            rows.append((candidate["session_id"], scored))
+
+    if not rows:
+        return 0
+
+    result = await conn.execute(
+        """
+        INSERT INTO job_matches (
+            session_id, resume_id, job_posting_id, match_score, analysis,
+            tech_match_score, experience_match_score, created_at, updated_at
+        )
+        SELECT m.session_id, NULL, $1, m.match_score, m.analysis::jsonb,
+               m.tech_score, m.experience_score, NOW(), NOW()
+        FROM unnest($2::int[], $3::float8[], $4::text[], $5::float8[], $6::float8[])
+            AS m(session_id, match_score, analysis, tech_score, experience_score)
+        ON CONFLICT (session_id, job_posting_id) DO NOTHING
+        """,
+        job_posting_id,
+        [session_id for session_id, _ in rows],
+        [scored["match_score"] for _, scored in rows],
+        [json.dumps(scored["analysis"]) for _, scored in rows],
+        [scored["tech_match_score"] for _, scored in rows],
+        [scored["experience_match_score"] for _, scored in rows],
+    )
+    return int(result.split()[-1])
+
+
+async def drain_match_queue(conn: asyncpg.Connection, batch_size: int = QUEUE_BATCH_SIZE) -> Dict[str, int]:
+    """job_posting_match_queue에서 공고를 꺼내 역매칭합니다.
+
+    공고마다 savepoint를 두어 한 공고가 실패해도 같은 배치의 나머지는 반영합니다.
+    실패한 공고는 attempts/last_error를 기록해 큐에 다시 넣고, 이번 실행에서는 다시 꺼내지 않으며
+    MAX_ATTEMPTS번 실패하면 더 이상 처리하지 않습니다 (공고가 다시 바뀌면 트리거가 초기화).
+    """
+    postings = 0
+    matches = 0
+    failed: List[int] = []
+    while True:
+        async with conn.transaction():
+            queued = await conn.fetch(
+                """
+                DELETE FROM job_posting_match_queue
+                WHERE job_posting_id IN (
+                    SELECT job_posting_id FROM job_posting_match_queue
+                    WHERE attempts < $2 AND job_posting_id <> ALL($3::int[])
+                    ORDER BY enqueued_at ASC
+                    LIMIT $1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING job_posting_id, attempts
+                """,
+                batch_size,
+                MAX_ATTEMPTS,
+                failed,
+            )
+            for row in queued:
+                job_posting_id = row["job_posting_id"]
+                try:
+                    async with conn.transaction():
+                        matches += await reverse_match_posting(conn, job_posting_id)
+                    postings += 1
+                except Exception as exc:
+                    failed.append(job_posting_id)
+                    print(f"역매칭 실패: 공고 {job_posting_id} ({exc})", file=sys.stderr)
+                    await conn.execute(
+                        """
+                        INSERT INTO job_posting_match_queue (job_posting_id, enqueued_at, attempts, last_error)
+                        VALUES ($1, NOW(), $2, $3)
+                        ON CONFLICT (job_posting_id) DO UPDATE
+                        SET attempts = EXCLUDED.attempts, last_error = EXCLUDED.last_error
+                        """,
+                        job_posting_id,
+                        row["attempts"] + 1,
+                        str(exc),
+                    )
+        if len(queued) < batch_size:
+            break
+
+    return {"postings": postings, "matches": matches, "failed": len(failed)}
+
+
+async def main() -> None:
+    from main import DATABASE_CONFIG
+
+    parser = argparse.ArgumentParser(description="신규/변경 공고 역매칭 작업")
+    parser.add_argument("--interval", type=float, default=0, help="반복 실행 간격(초), 0이면 한 번만 실행")
+    parser.add_argument("--batch", type=int, default=QUEUE_BATCH_SIZE, help="트랜잭션당 처리할 공고 수")
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(**DATABASE_CONFIG)
+    try:
+        while True:
+            result = await drain_match_queue(conn, args.batch)
+            if result["postings"] or result["failed"]:
+                print(
+                    f"역매칭 완료: 공고 {result['postings']}개, 매칭 {result['matches']}건, 실패 {result['failed']}개"
+                )
+            if not args.interval:
+                break
+            await asyncio.sleep(args.interval)
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
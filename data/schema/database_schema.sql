@@ -2,6 +2,9 @@
 
 -- DROP TABLE IF EXISTS applications CASCADE;
 -- DROP TABLE IF EXISTS job_matches CASCADE;
+-- DROP TABLE IF EXISTS job_posting_match_queue CASCADE;
+-- DROP TABLE IF EXISTS chat_session_archives CASCADE;
+-- DROP TABLE IF EXISTS resume_features CASCADE;
 -- DROP TABLE IF EXISTS resume_additional_info CASCADE;
 -- DROP TABLE IF EXISTS resume_skills CASCADE;
 -- DROP TABLE IF EXISTS resume_projects CASCADE;
@@ -33,18 +36,86 @@ CREATE TABLE chat_sessions (
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
+-- chat_messages는 created_at 기준 월 단위 RANGE 파티션 (PK에 파티션 키 포함 필요)
 CREATE TABLE chat_messages (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     session_id INTEGER REFERENCES chat_sessions(id) ON DELETE CASCADE,
     role VARCHAR(20) NOT NULL,
     content TEXT NOT NULL,
     metadata JSONB,
-    created_at TIMESTAMP DEFAULT NOW(),
-    updated_at TIMESTAMP DEFAULT NOW()
-);
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE chat_messages_default PARTITION OF chat_messages DEFAULT;
 
 CREATE INDEX idx_chat_messages_session ON chat_messages(session_id, created_at);
 
+-- start_month부터 months개월치 월 파티션을 생성 (이미 있으면 건너뜀)
+-- 기본 파티션에 해당 월 데이터가 쌓여 있으면 새 파티션으로 옮긴 뒤 연결하고,
+-- 한 달이 실패해도 다음 달을 계속 처리하고, 새로 만든/실패한 달을 한 행씩 반환
+-- (실패한 달은 error_message가 채워짐)
+CREATE OR REPLACE FUNCTION create_chat_message_partitions(start_month DATE, months INTEGER)
+RETURNS TABLE (month_partition TEXT, error_message TEXT) AS $$
+DECLARE
+    month_start DATE := date_trunc('month', start_month)::DATE;
+    month_end DATE;
+    partition_name TEXT;
+BEGIN
+    FOR i IN 0..months - 1 LOOP
+        month_end := (month_start + INTERVAL '1 month')::DATE;
+        partition_name := format('chat_messages_%s', to_char(month_start, 'YYYYMM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            month_partition := partition_name;
+            error_message := NULL;
+            BEGIN
+                EXECUTE format(
+                    'CREATE TABLE %I (LIKE chat_messages INCLUDING DEFAULTS)',
+                    partition_name
+                );
+                EXECUTE format(
+                    'WITH moved AS (
+                         DELETE FROM chat_messages_default
+                         WHERE created_at >= %L AND created_at < %L
+                         RETURNING *
+                     )
+                     INSERT INTO %I SELECT * FROM moved',
+                    month_start,
+                    month_end,
+                    partition_name
+                );
+                EXECUTE format(
+                    'ALTER TABLE chat_messages ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                    partition_name,
+                    month_start,
+                    month_end
+                );
+            EXCEPTION WHEN OTHERS THEN
+                error_message := SQLERRM;
+                RAISE WARNING 'chat_messages partition % failed: %', partition_name, SQLERRM;
+            END;
+            RETURN NEXT;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT * FROM create_chat_message_partitions(CURRENT_DATE, 3);
+
+-- 비활성 세션의 메시지를 압축(zlib) JSON 한 건으로 보관, 조회 시 chat_messages로 복원
+CREATE TABLE chat_session_archives (
+    session_id INTEGER PRIMARY KEY REFERENCES chat_sessions(id) ON DELETE CASCADE,
+    message_count INTEGER NOT NULL,
+    first_message_at TIMESTAMP,
+    last_message_at TIMESTAMP,
+    transcript BYTEA NOT NULL,
+    archived_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX idx_chat_sessions_last_message ON chat_sessions(last_message_at) WHERE status = 'active';
+
 CREATE TABLE candidate_profiles (
     id SERIAL PRIMARY KEY,
     session_id INTEGER UNIQUE REFERENCES chat_sessions(id) ON DELETE CASCADE,
@@ -55,11 +126,17 @@ CREATE TABLE candidate_profiles (
     skills JSONB,
     experiences JSONB,
     preferences JSONB,
+    skill_keywords TEXT[] DEFAULT '{}',
+    preferred_roles TEXT[] DEFAULT '{}',
     last_generated_at TIMESTAMP DEFAULT NOW(),
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
+-- 신규 공고 → 후보자 역매칭 시 후보 검색용
+CREATE INDEX idx_candidate_profiles_skill_keywords ON candidate_profiles USING GIN(skill_keywords);
+CREATE INDEX idx_candidate_profiles_preferred_roles ON candidate_profiles USING GIN(preferred_roles);
+
 CREATE TABLE resumes (
     id SERIAL PRIMARY KEY,
     user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
@@ -155,6 +232,16 @@ CREATE TABLE resume_additional_info (
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
+-- 매칭용 이력서 특징 벡터 (섹션 변경 시 해당 컬럼만 갱신)
+CREATE TABLE resume_features (
+    resume_id INTEGER PRIMARY KEY REFERENCES resumes(id) ON DELETE CASCADE,
+    skills TEXT[] DEFAULT '{}',
+    project_tech TEXT[] DEFAULT '{}',
+    positions TEXT[] DEFAULT '{}',
+    experience_periods DATEMULTIRANGE DEFAULT '{}',
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
 CREATE TABLE job_postings (
     id SERIAL PRIMARY KEY,
     source VARCHAR(50) NOT NULL,
@@ -185,6 +272,45 @@ CREATE TABLE job_postings (
     UNIQUE(source, external_id)
 );
 
+-- 공고 INSERT/UPDATE 시 역매칭 대상으로 적재 (reverse_matching.py가 소비)
+CREATE TABLE job_posting_match_queue (
+    job_posting_id INTEGER PRIMARY KEY REFERENCES job_postings(id) ON DELETE CASCADE,
+    enqueued_at TIMESTAMP DEFAULT NOW(),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+
+CREATE OR REPLACE FUNCTION enqueue_job_posting_match()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.is_active THEN
+        INSERT INTO job_posting_match_queue (job_posting_id)
+        VALUES (NEW.id)
+        ON CONFLICT (job_posting_id) DO UPDATE
+        SET enqueued_at = NOW(), attempts = 0, last_error = NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_job_postings_match_queue_insert
+    AFTER INSERT ON job_postings
+    FOR EACH ROW EXECUTE FUNCTION enqueue_job_posting_match();
+
+-- 카탈로그 재동기화처럼 값이 그대로인 UPDATE는 큐에 넣지 않음
+CREATE TRIGGER trg_job_postings_match_queue_update
+    AFTER UPDATE OF position, tech_stacks, experience_min, experience_max, is_active
+    ON job_postings
+    FOR EACH ROW
+    WHEN (
+        OLD.position IS DISTINCT FROM NEW.position
+        OR OLD.tech_stacks IS DISTINCT FROM NEW.tech_stacks
+        OR OLD.experience_min IS DISTINCT FROM NEW.experience_min
+        OR OLD.experience_max IS DISTINCT FROM NEW.experience_max
+        OR OLD.is_active IS DISTINCT FROM NEW.is_active
+    )
+    EXECUTE FUNCTION enqueue_job_posting_match();
+
 CREATE TABLE job_matches (
     id SERIAL PRIMARY KEY,
     resume_id INTEGER REFERENCES resumes(id) ON DELETE CASCADE,
@@ -221,6 +347,6 @@ CREATE INDEX idx_resumes_user ON resumes(user_id);
 CREATE INDEX idx_job_postings_position ON job_postings(position);
 CREATE INDEX idx_job_postings_is_active ON job_postings(is_active);
 CREATE INDEX idx_job_postings_tech_stacks ON job_postings USING GIN(tech_stacks);
-CREATE INDEX idx_matches_resume ON job_matches(resume_id);
+CREATE INDEX idx_matches_resume ON job_matches(resume_id, match_score DESC);
 CREATE INDEX idx_matches_session ON job_matches(session_id);
 CREATE INDEX idx_matches_score ON job_matches(match_score DESC);
@@ -0,0 +1,137 @@
+-- 기존(비파티션) chat_messages를 월 단위 RANGE 파티션 테이블로 전환
+-- 실행: psql job_matching < data/schema/migrations/001_partition_chat_messages.sql
+--
+-- 주의: 전체 복사가 끝날 때까지 chat_messages에 ACCESS EXCLUSIVE 잠금을 잡으므로
+-- 그동안 채팅 조회/전송이 모두 대기합니다. 로컬 측정 기준 메시지 100만 건당 약 14초가
+-- 걸리므로 점검 시간에 백엔드를 내리고 실행하세요. 사전에 `chat_archive.py archive`로
+-- 비활성 세션을 보관해 두면 복사량과 중단 시간을 줄일 수 있습니다.
+
+BEGIN;
+
+-- start_month부터 months개월치 월 파티션을 생성 (이미 있으면 건너뜀)
+-- 기본 파티션에 해당 월 데이터가 쌓여 있으면 새 파티션으로 옮긴 뒤 연결하고,
+-- 한 달이 실패해도 다음 달을 계속 처리하고, 새로 만든/실패한 달을 한 행씩 반환
+-- (실패한 달은 error_message가 채워짐)
+DROP FUNCTION IF EXISTS create_chat_message_partitions(DATE, INTEGER);
+CREATE OR REPLACE FUNCTION create_chat_message_partitions(start_month DATE, months INTEGER)
+RETURNS TABLE (month_partition TEXT, error_message TEXT) AS $$
+DECLARE
+    month_start DATE := date_trunc('month', start_month)::DATE;
+    month_end DATE;
+    partition_name TEXT;
+BEGIN
+    FOR i IN 0..months - 1 LOOP
+        month_end := (month_start + INTERVAL '1 month')::DATE;
+        partition_name := format('chat_messages_%s', to_char(month_start, 'YYYYMM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            month_partition := partition_name;
+            error_message := NULL;
+            BEGIN
+                EXECUTE format(
+                    'CREATE TABLE %I (LIKE chat_messages INCLUDING DEFAULTS)',
+                    partition_name
+                );
+                EXECUTE format(
+                    'WITH moved AS (
+                         DELETE FROM chat_messages_default
+                         WHERE created_at >= %L AND created_at < %L
+                         RETURNING *
+                     )
+                     INSERT INTO %I SELECT * FROM moved',
+                    month_start,
+                    month_end,
+                    partition_name
+                );
+                EXECUTE format(
+                    'ALTER TABLE chat_messages ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                    partition_name,
+                    month_start,
+                    month_end
+                );
+            EXCEPTION WHEN OTHERS THEN
+                error_message := SQLERRM;
+                RAISE WARNING 'chat_messages partition % failed: %', partition_name, SQLERRM;
+            END;
+            RETURN NEXT;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TABLE IF NOT EXISTS chat_session_archives (
+    session_id INTEGER PRIMARY KEY REFERENCES chat_sessions(id) ON DELETE CASCADE,
+    message_count INTEGER NOT NULL,
+    first_message_at TIMESTAMP,
+    last_message_at TIMESTAMP,
+    transcript BYTEA NOT NULL,
+    archived_at TIMESTAMP DEFAULT NOW()
+);
+
+LOCK TABLE chat_messages IN ACCESS EXCLUSIVE MODE;
+
+ALTER TABLE chat_messages RENAME TO chat_messages_legacy;
+ALTER TABLE chat_messages_legacy RENAME CONSTRAINT chat_messages_pkey TO chat_messages_legacy_pkey;
+ALTER INDEX idx_chat_messages_session RENAME TO idx_chat_messages_legacy_session;
+
+CREATE TABLE chat_messages (
+    id SERIAL,
+    session_id INTEGER REFERENCES chat_sessions(id) ON DELETE CASCADE,
+    role VARCHAR(20) NOT NULL,
+    content TEXT NOT NULL,
+    metadata JSONB,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE chat_messages_default PARTITION OF chat_messages DEFAULT;
+
+CREATE INDEX idx_chat_messages_session ON chat_messages(session_id, created_at);
+
+-- 가장 오래된 메시지가 속한 달부터 현재 + 3개월까지 파티션 생성 (한 달이라도 실패하면 전체 롤백)
+DO $$
+DECLARE
+    first_month DATE;
+    failed TEXT;
+BEGIN
+    SELECT date_trunc('month', COALESCE(MIN(created_at), NOW()))::DATE
+    INTO first_month
+    FROM chat_messages_legacy;
+
+    SELECT string_agg(p.month_partition || ': ' || p.error_message, ', ')
+    INTO failed
+    FROM create_chat_message_partitions(
+        first_month,
+        (
+            (EXTRACT(YEAR FROM AGE(date_trunc('month', CURRENT_DATE), first_month)) * 12
+             + EXTRACT(MONTH FROM AGE(date_trunc('month', CURRENT_DATE), first_month)))::INTEGER
+            + 3
+        )
+    ) AS p
+    WHERE p.error_message IS NOT NULL;
+
+    IF failed IS NOT NULL THEN
+        RAISE EXCEPTION 'chat_messages partition creation failed: %', failed;
+    END IF;
+END;
+$$;
+
+INSERT INTO chat_messages (id, session_id, role, content, metadata, created_at, updated_at)
+SELECT id, session_id, role, content, metadata, COALESCE(created_at, NOW()), updated_at
+FROM chat_messages_legacy;
+
+SELECT setval(
+    pg_get_serial_sequence('chat_messages', 'id'),
+    COALESCE((SELECT MAX(id) FROM chat_messages), 0) + 1,
+    false
+);
+
+DROP TABLE chat_messages_legacy;
+
+CREATE INDEX IF NOT EXISTS idx_chat_sessions_last_message
+    ON chat_sessions(last_message_at) WHERE status = 'active';
+
+COMMIT;
+
+ANALYZE chat_messages;
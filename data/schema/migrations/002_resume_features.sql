@@ -0,0 +1,49 @@
+-- 이력서 특징 벡터 테이블 추가 및 기존 이력서 일괄 계산
+-- 실행: psql job_matching < data/schema/migrations/002_resume_features.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS resume_features (
+    resume_id INTEGER PRIMARY KEY REFERENCES resumes(id) ON DELETE CASCADE,
+    skills TEXT[] DEFAULT '{}',
+    project_tech TEXT[] DEFAULT '{}',
+    positions TEXT[] DEFAULT '{}',
+    experience_periods DATEMULTIRANGE DEFAULT '{}',
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+DROP INDEX IF EXISTS idx_matches_resume;
+CREATE INDEX idx_matches_resume ON job_matches(resume_id, match_score DESC);
+
+INSERT INTO resume_features (resume_id, skills, project_tech, positions, experience_periods, updated_at)
+SELECT r.id,
+       COALESCE((
+           SELECT array_agg(DISTINCT lower(btrim(skill)))
+           FROM resume_skills rs CROSS JOIN LATERAL unnest(rs.skills) AS skill
+           WHERE rs.resume_id = r.id AND btrim(skill) <> ''
+       ), '{}'),
+       COALESCE((
+           SELECT array_agg(DISTINCT lower(btrim(tech)))
+           FROM resume_projects rp
+           CROSS JOIN LATERAL jsonb_array_elements_text(
+               CASE WHEN jsonb_typeof(rp.tech_stacks) = 'array' THEN rp.tech_stacks ELSE '[]'::jsonb END
+           ) AS tech
+           WHERE rp.resume_id = r.id AND btrim(tech) <> ''
+       ), '{}'),
+       COALESCE((
+           SELECT array_agg(DISTINCT lower(btrim(position)))
+           FROM resume_experiences WHERE resume_id = r.id AND btrim(position) <> ''
+       ), '{}'),
+       COALESCE((
+           SELECT range_agg(daterange(
+               start_date,
+               CASE WHEN is_current OR end_date IS NULL THEN 'infinity'::DATE ELSE end_date END
+           ))
+           FROM resume_experiences
+           WHERE resume_id = r.id AND (end_date IS NULL OR end_date >= start_date)
+       ), '{}'),
+       NOW()
+FROM resumes r
+ON CONFLICT (resume_id) DO NOTHING;
+
+COMMIT;
@@ -0,0 +1,83 @@
+-- 신규/변경 공고 역매칭: 후보 검색용 키워드 컬럼 + GIN 인덱스, 공고 큐 및 트리거
+-- 실행: psql job_matching < data/schema/migrations/003_reverse_matching.sql
+
+BEGIN;
+
+ALTER TABLE candidate_profiles
+    ADD COLUMN IF NOT EXISTS skill_keywords TEXT[] DEFAULT '{}',
+    ADD COLUMN IF NOT EXISTS preferred_roles TEXT[] DEFAULT '{}';
+
+-- 기존 프로필 JSON에서 키워드 추출 (main.py의 _keyword_list와 동일한 규칙:
+-- 객체면 배열 값들의 항목, 배열이면 항목, 문자열이면 그 값 하나)
+CREATE FUNCTION pg_temp.profile_keywords(doc JSONB)
+RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(DISTINCT lower(btrim(k.item))), '{}')
+    FROM (
+        SELECT item
+        FROM jsonb_each(CASE WHEN jsonb_typeof(doc) = 'object' THEN doc ELSE '{}'::jsonb END) AS e
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(e.value) = 'array' THEN e.value ELSE '[]'::jsonb END
+        ) AS item
+        UNION ALL
+        SELECT item
+        FROM jsonb_array_elements_text(CASE WHEN jsonb_typeof(doc) = 'array' THEN doc ELSE '[]'::jsonb END) AS item
+        UNION ALL
+        SELECT doc #>> '{}' WHERE jsonb_typeof(doc) = 'string'
+    ) AS k(item)
+    WHERE btrim(k.item) <> ''
+$$ LANGUAGE sql;
+
+UPDATE candidate_profiles
+SET skill_keywords = pg_temp.profile_keywords(skills),
+    preferred_roles = pg_temp.profile_keywords(
+        CASE WHEN jsonb_typeof(preferences) = 'object' THEN preferences -> 'roles' END
+    );
+
+CREATE INDEX IF NOT EXISTS idx_candidate_profiles_skill_keywords ON candidate_profiles USING GIN(skill_keywords);
+CREATE INDEX IF NOT EXISTS idx_candidate_profiles_preferred_roles ON candidate_profiles USING GIN(preferred_roles);
+
+CREATE TABLE IF NOT EXISTS job_posting_match_queue (
+    job_posting_id INTEGER PRIMARY KEY REFERENCES job_postings(id) ON DELETE CASCADE,
+    enqueued_at TIMESTAMP DEFAULT NOW(),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+
+ALTER TABLE job_posting_match_queue
+    ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS last_error TEXT;
+
+CREATE OR REPLACE FUNCTION enqueue_job_posting_match()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.is_active THEN
+        INSERT INTO job_posting_match_queue (job_posting_id)
+        VALUES (NEW.id)
+        ON CONFLICT (job_posting_id) DO UPDATE
+        SET enqueued_at = NOW(), attempts = 0, last_error = NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_job_postings_match_queue_insert ON job_postings;
+DROP TRIGGER IF EXISTS trg_job_postings_match_queue_update ON job_postings;
+CREATE TRIGGER trg_job_postings_match_queue_insert
+    AFTER INSERT ON job_postings
+    FOR EACH ROW EXECUTE FUNCTION enqueue_job_posting_match();
+
+-- 카탈로그 재동기화처럼 값이 그대로인 UPDATE는 큐에 넣지 않음
+CREATE TRIGGER trg_job_postings_match_queue_update
+    AFTER UPDATE OF position, tech_stacks, experience_min, experience_max, is_active
+    ON job_postings
+    FOR EACH ROW
+    WHEN (
+        OLD.position IS DISTINCT FROM NEW.position
+        OR OLD.tech_stacks IS DISTINCT FROM NEW.tech_stacks
+        OR OLD.experience_min IS DISTINCT FROM NEW.experience_min
+        OR OLD.experience_max IS DISTINCT FROM NEW.experience_max
+        OR OLD.is_active IS DISTINCT FROM NEW.is_active
+    )
+    EXECUTE FUNCTION enqueue_job_posting_match();
+
+COMMIT;